@@ -1,9 +1,21 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+
+# Optional compiled scanner for large documents, skipped without Cython
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension("src._generator_fast", ["src/_generator_fast.pyx"], optional=True)],
+        language_level=3,
+    )
 
 setup(
     name="markdown-toc",
     version="0.1.0",
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         "pyyaml>=6.0.1",
     ],
@@ -1,4 +1,11 @@
 """Markdown TOC Generator package."""
-from .generator import MarkdownTOCGenerator
 
 __version__ = '0.1.0'
+__all__ = ['MarkdownTOCGenerator']
+
+def __getattr__(name):
+    # Import the generator on first access so the CLI can parse arguments without it
+    if name == 'MarkdownTOCGenerator':
+        from .generator import MarkdownTOCGenerator
+        return MarkdownTOCGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
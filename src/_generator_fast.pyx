@@ -0,0 +1,20 @@
+# cython: language_level=3
+"""Compiled versions of the hot loops in the Markdown TOC generator."""
+
+
+def find_candidates(list lines, toc_titles):
+    """
+    Find the lines that may be headers or TOC titles.
+
+    :param lines: Markdown lines
+    :param toc_titles: Set of TOC titles to remove
+    :return: Indices of lines starting with '#' or matching a TOC title
+    """
+    cdef list candidates = []
+    cdef Py_ssize_t i
+    cdef str line
+    for i in range(len(lines)):
+        line = lines[i]
+        if (len(line) > 0 and line[0] == u'#') or line.strip() in toc_titles:
+            candidates.append(i)
+    return candidates
@@ -3,14 +3,14 @@
 import sys
 import argparse
 from pathlib import Path
-from .generator import MarkdownTOCGenerator
 
 def find_readme() -> Path:
     """Find the README.md file in the current directory."""
     current_dir = Path.cwd()
-    readme_candidates = list(current_dir.glob('README.md')) + list(current_dir.glob('readme.md'))
-    if readme_candidates:
-        return readme_candidates[0]
+    for name in ('README.md', 'readme.md'):
+        readme_path = current_dir / name
+        if readme_path.is_file():
+            return readme_path
     return None
 
 def main():
@@ -59,6 +59,9 @@ Examples:
     )
     
     args = parser.parse_args()
+
+    # Imported only once arguments are parsed so --help and --version stay fast
+    from .generator import MarkdownTOCGenerator
     
     # If no input file is specified, try to find README.md
     if args.input_file is None:
@@ -78,8 +81,7 @@ Examples:
     
     # Read input file
     try:
-        with open(args.input_file, 'r') as f:
-            markdown_content = f.read()
+        markdown_content = args.input_file.read_text(encoding='utf-8')
     except Exception as e:
         print(f"Error reading input file: {e}")
         sys.exit(1)
@@ -87,16 +89,16 @@ Examples:
     # Generate TOC
     try:
         toc_generator = MarkdownTOCGenerator(args.config)
-        updated_content = toc_generator.generate_toc(markdown_content)
+        output_lines = toc_generator.iter_toc(markdown_content)
     except Exception as e:
         print(f"Error generating TOC: {e}")
         sys.exit(1)
     
-    # Write output
+    # Write output, streaming the lines instead of joining them first
     try:
         output_file = Path(args.output) if args.output else args.input_file
-        with open(output_file, 'w') as f:
-            f.write(updated_content)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.writelines(output_lines)
         print(f"Table of Contents generated in {output_file}")
     except Exception as e:
         print(f"Error writing output file: {e}")
@@ -1,10 +1,66 @@
 #!/usr/bin/env python3
 
+import copy
+import os
 import re
-import argparse
-import yaml
-from typing import List, Dict, Optional
-from pathlib import Path
+from functools import lru_cache
+from itertools import chain, islice
+
+_LINK_STRIP_RE = re.compile(r'[^\w\s-]')
+_LINK_SPACE_RE = re.compile(r'\s+')
+
+# Parsed configuration files keyed by (absolute path, mtime, size)
+_CONFIG_CACHE = {}
+
+# Common TOC titles removed from existing documents
+_TOC_TITLES = frozenset({
+    '## Table of Contents',
+    '## Contents',
+    '## TOC',
+    '## Index',
+})
+
+# Indentation for each level of the nested TOC format
+_INDENTS = tuple('    ' * level for level in range(6))
+
+def _is_h1(line: str) -> bool:
+    """Check whether a line is an H1 header ('#' followed by whitespace)."""
+    return line[:1] == '#' and line[1:2].isspace()
+
+def _is_header(line: str) -> bool:
+    """Check whether a line is a header of any level ('#'s followed by whitespace)."""
+    return line[:1] == '#' and line.lstrip('#')[:1].isspace()
+
+def _parse_header(line: str):
+    """
+    Split a header line into its level and text.
+    
+    :param line: Line to parse
+    :return: (level, text) tuple, or None if the line is not a header with text
+    """
+    if line[:1] != '#':
+        return None
+    text = line.lstrip('#')
+    if len(text) < 2 or not text[0].isspace():
+        return None
+    return len(line) - len(text), text[1:]
+
+def _find_candidates(lines, toc_titles):
+    """
+    Find the lines that may be headers or TOC titles.
+    
+    :param lines: Markdown lines
+    :param toc_titles: Set of TOC titles to remove
+    :return: Indices of lines starting with '#' or matching a TOC title
+    """
+    return [i for i, line in enumerate(lines)
+            if line[:1] == '#' or line.strip() in toc_titles]
+
+try:
+    # Use the compiled scan when the optional Cython extension is built
+    from ._generator_fast import find_candidates as _find_candidates
+except ImportError:
+    pass
 
 class MarkdownTOCGenerator:
     def __init__(self, config_path=None):
@@ -25,30 +81,47 @@ class MarkdownTOCGenerator:
         
         :param config_path: Path to the configuration file
         """
+        # Imported lazily so runs without a config file never load PyYAML
+        import yaml
+
         try:
-            with open(config_path, 'r') as config_file:
-                user_config = yaml.safe_load(config_file)
-                self.config.update(user_config)
+            # Reuse the parsed file while it is unchanged on disk
+            stat = os.stat(config_path)
+            cache_key = (os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+            if cache_key not in _CONFIG_CACHE:
+                with open(config_path, 'r') as config_file:
+                    _CONFIG_CACHE[cache_key] = yaml.safe_load(config_file)
+            # Copy so instances never share mutable values with the cache
+            self.config.update(copy.deepcopy(_CONFIG_CACHE[cache_key]))
         except FileNotFoundError:
             print(f"Warning: Configuration file {config_path} not found. Using default settings.")
         except yaml.YAMLError as e:
             print(f"Error parsing configuration file: {e}")
 
-    def _convert_to_link(self, header_text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _convert_to_link(header_text: str) -> str:
         """
         Convert header text to GitHub-style markdown link.
+
+        Results are memoised, so header texts that repeat within a document,
+        or across generators in a long-running process, reuse their links.
         
         :param header_text: Original header text
         :return: Converted link
         """
-        # Remove special characters and convert to lowercase
-        link = re.sub(r'[^\w\s-]', '', header_text.lower())
+        link = header_text.lower()
+        # Single-word headers have nothing to strip or replace
+        if link.isalnum():
+            return link
+        # Remove special characters
+        link = _LINK_STRIP_RE.sub('', link)
         # Replace spaces with hyphens
-        link = re.sub(r'\s+', '-', link)
+        link = _LINK_SPACE_RE.sub('-', link)
         return link
 
     def _generate_toc(self, headers):
-        """Generate table of contents from headers."""
+        """Generate table of contents lines from headers."""
         toc_lines = [self.config['toc_title']]
 
         if self.config['indent_style'] == 'github':
@@ -65,18 +138,50 @@ class MarkdownTOCGenerator:
                 # Update section numbers
                 current_section[indent] += 1
                 # Reset all deeper levels
-                for i in range(indent + 1, 6):
-                    current_section[i] = 0
+                current_section[indent + 1:] = [0] * (5 - indent)
                 
                 # Generate section number string (e.g., "1.2.3")
                 section_nums = current_section[:indent + 1]
                 section_number = '.'.join(str(n) for n in section_nums if n != 0)
                 
                 # Add indentation
-                indent_spaces = '    ' * indent
-                toc_lines.append(f"{indent_spaces}{section_number}. [{text}](#{link})")
+                toc_lines.append(f"{_INDENTS[indent]}{section_number}. [{text}](#{link})")
 
-        return '\n'.join(toc_lines)
+        return toc_lines
+
+    @staticmethod
+    def _dedup_blanks(lines):
+        """
+        Collapse runs of blank lines, keeping the last line of each run.
+        
+        :param lines: Iterable of lines
+        :return: Generator of the remaining lines
+        """
+        pending_blank = None
+        for line in lines:
+            if not line.strip():
+                pending_blank = line
+                continue
+            if pending_blank is not None:
+                yield pending_blank
+                pending_blank = None
+            yield line
+        if pending_blank is not None:
+            yield pending_blank
+
+    @staticmethod
+    def _add_line_endings(lines):
+        """
+        Append a newline to every line but the last.
+        
+        :param lines: Iterator of lines
+        :return: Generator of lines with line endings
+        """
+        previous = next(lines)
+        for line in lines:
+            yield previous + '\n'
+            previous = line
+        yield previous
 
     def generate_toc(self, markdown_content: str) -> str:
         """
@@ -85,70 +190,120 @@ class MarkdownTOCGenerator:
         :param markdown_content: Full markdown text
         :return: Markdown content with inserted TOC
         """
-        lines = markdown_content.split('\n')
+        return '\n'.join(self._iter_output(markdown_content))
+
+    def iter_toc(self, markdown_content: str):
+        """
+        Generate Table of Contents for the given markdown content line by line.
+        
+        The content is analysed before this returns, so errors are raised
+        before any line is produced.
+        
+        :param markdown_content: Full markdown text
+        :return: Iterator over the output lines, each ending with a newline except the last
+        """
+        return self._add_line_endings(self._iter_output(markdown_content))
+
+    def write_toc(self, markdown_content: str, out_fp):
+        """
+        Generate Table of Contents and stream the result to a file object.
+        
+        Opening a file in 'w' mode truncates it before anything is generated,
+        so do not pass a file opened that way on the input path: an error
+        would leave the input empty. Use iter_toc() to generate first and
+        open the output file only afterwards.
         
-        # Find H1 header if it exists
-        h1_index = next((i for i, line in enumerate(lines) 
-                        if re.match(r'^#\s', line)), -1)
+        :param markdown_content: Full markdown text
+        :param out_fp: Text file object to write the updated content to
+        """
+        out_fp.writelines(self.iter_toc(markdown_content))
+
+    def _iter_output(self, markdown_content: str):
+        """
+        Analyse the markdown content and lay out the output lines.
+        
+        :param markdown_content: Full markdown text
+        :return: Iterator over the output lines, without line endings
+        """
+        lines = markdown_content.split('\n')
+            
+        # Common TOC titles to remove (including configured title)
+        toc_titles = _TOC_TITLES | {self.config['toc_title'].strip()}
+        # Header texts of those titles, which are never listed in the TOC
+        toc_names = {title.lstrip('#').strip() for title in toc_titles}
+        # Configured header levels as a set for constant-time lookups
+        header_levels = frozenset(self.config['header_levels'])
+
+        # Only headers and TOC titles affect the layout, so skip body text up front
+        candidates = _find_candidates(lines, toc_titles)
+
+        # Drop existing TOCs, find the H1 header and remember every header
+        # that follows it, copying the kept lines over in whole runs
+        out = []
+        run_start = 0  # first kept line not yet copied to out
+        h1_index = -1
+        header_lines = []  # (index, line) pairs of headers after the H1
+        toc_start = -1
+        for i in candidates:
+            line = lines[i]
+            is_header = _is_header(line)
+            if toc_start != -1:
+                if not is_header:
+                    continue
+                # The TOC ends at the next header or empty line followed by header
+                run_start = i - 1 if i - 1 > toc_start and lines[i - 1].strip() == '' else i
+                toc_start = -1
+            if line.strip() in toc_titles:
+                out.extend(lines[run_start:i])
+                toc_start = i
+                continue
+            if is_header:
+                index = len(out) + i - run_start
+                if h1_index == -1 and _is_h1(line):
+                    # Headers seen so far precede the H1 and are not part of the TOC
+                    h1_index = index
+                    header_lines = []
+                elif index:
+                    header_lines.append((index, line))
+        # Without an existing TOC the original lines are used as they are
+        if run_start or toc_start != -1:
+            if toc_start == -1:
+                out.extend(lines[run_start:])
+            lines = out
+
         if h1_index == -1:
             # If no H1 found, insert at the beginning
             h1_index = 0
-            
-        # Common TOC titles to remove (including configured title)
-        toc_titles = {
-            '## Table of Contents',
-            '## Contents',
-            '## TOC',
-            '## Index',
-            self.config['toc_title'].strip()
-        }
-            
-        # Remove any existing TOCs
-        i = 0
-        while i < len(lines):
-            if lines[i].strip() in toc_titles:
-                # Find the end of TOC (next header or empty line followed by header)
-                j = i + 1
-                while j < len(lines):
-                    if re.match(r'^#+\s', lines[j]) or (j + 1 < len(lines) and lines[j].strip() == '' and re.match(r'^#+\s', lines[j + 1])):
-                        break
-                    j += 1
-                lines = lines[:i] + lines[j:]
-                i = 0  # Start over to catch any other TOCs
-            else:
-                i += 1
-        
+
         # Find the end of the initial description (first header after H1)
-        description_end = next((i for i in range(h1_index + 1, len(lines)) 
-                                if re.match(r'^#+\s', lines[i])), h1_index + 1)
+        description_end = header_lines[0][0] if header_lines else h1_index + 1
         
         # Clean up extra blank lines before TOC insertion
         while description_end > 0 and not lines[description_end - 1].strip():
             description_end -= 1
 
         # Find where to end the TOC (next header)
-        content_start = next((i for i in range(description_end + 1, len(lines)) 
-                            if re.match(r'^#+\s', lines[i])), len(lines))
+        content_start = next((i for i, _ in header_lines if i > description_end), len(lines))
 
         # Collect headers matching the configured levels
         headers = []
         current_h2 = None
         counter = 1
-        for i, line in enumerate(lines[description_end:], start=description_end):
-            # Check if line is a header and matches configured levels
-            match = re.match(r'^(#+)\s(.+)$', line)
-            if match:
-                header_level = len(match.group(1))
-                header_text = match.group(2)
+        for _, line in header_lines:
+            # Check if header matches configured levels
+            header = _parse_header(line)
+            if header:
+                header_level, header_text = header
                 
-                if header_level in self.config['header_levels']:
+                if header_level in header_levels:
                     header_title = header_text.strip()
                     # Skip if it's any known TOC title
-                    if any(title.lstrip('#').strip() == header_title for title in toc_titles):
+                    if header_title in toc_names:
                         continue
                     if header_level == 2:
-                        current_h2 = (header_text, self._convert_to_link(header_text))
-                        headers.append((0, counter, header_text, self._convert_to_link(header_text)))
+                        link = self._convert_to_link(header_text)
+                        current_h2 = (header_text, link)
+                        headers.append((0, counter, header_text, link))
                         counter += 1
                     elif header_level == 3 and current_h2:
                         headers.append((1, counter, header_text, self._convert_to_link(header_text)))
@@ -158,19 +313,11 @@ class MarkdownTOCGenerator:
         toc_lines = self._generate_toc(headers)
         
         # Combine all sections with exactly one blank line between them
-        result = []
-        result.extend(lines[:description_end])
-        result.append('')  # Single blank line before TOC
-        result.extend(toc_lines.split('\n'))
-        result.append('')  # Single blank line after TOC
-        result.extend(lines[content_start:])
-        
-        # Remove any consecutive blank lines
-        i = 0
-        while i < len(result) - 1:
-            if not result[i].strip() and not result[i + 1].strip():
-                result.pop(i)
-            else:
-                i += 1
-        
-        return '\n'.join(result)
+        # and remove any consecutive blank lines
+        return self._dedup_blanks(chain(
+            islice(lines, description_end),
+            ('',),  # Single blank line before TOC
+            toc_lines,
+            ('',),  # Single blank line after TOC
+            islice(lines, content_start, None),
+        ))